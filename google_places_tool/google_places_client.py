@@ -6,14 +6,61 @@ Usage:
   - Run this file directly for a short demo, or import functions in your app.
 
 This module uses the HTTP Places endpoints and returns the raw JSON from Google.
-It intentionally keeps things small and synchronous for clarity.
+The plain functions are synchronous; `*_async` siblings and `batch_place_details`
+let callers fan out many lookups concurrently.
 """
 import os
 import sys
+import time
+import asyncio
+import threading
+import httpx
 import requests
-from typing import List, Dict, Any, Optional
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Tuple, Iterator, AsyncIterator
 
 BASE = "https://maps.googleapis.com/maps/api/place"
+# Places API (New). Used for searches when a field mask is requested, since the
+# legacy Text/Nearby Search endpoints always return (and bill) every field.
+V1_BASE = "https://places.googleapis.com/v1"
+
+# Google only activates a next_page_token a short time after returning it
+PAGE_TOKEN_DELAY = 2.0
+
+# In-process response caches (10 minutes). Legacy endpoints report errors such as OVER_QUERY_LIMIT
+# with HTTP 200, so only responses with one of these statuses (or no status, i.e. v1) are stored.
+_TEXT_SEARCH_CACHE = TTLCache(maxsize=1024, ttl=600)
+_DETAILS_CACHE = TTLCache(maxsize=1024, ttl=600)
+_CACHE_LOCK = threading.Lock()
+_CACHEABLE_STATUSES = frozenset({'OK', 'ZERO_RESULTS'})
+
+# Keys only Places API (New) items have; any one of them marks an item as v1
+_V1_ONLY_KEYS = frozenset({'id', 'displayName', 'location', 'formattedAddress', 'shortFormattedAddress'})
+
+# Everything normalize_place_summary reads, as Places API (New) field names.
+SUMMARY_FIELDS = ['id', 'displayName', 'rating', 'types', 'location', 'formattedAddress', 'shortFormattedAddress']
+
+# Shared session so repeated calls reuse keep-alive connections instead of
+# paying a fresh TCP+TLS handshake against maps.googleapis.com every time.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
+_ACLIENT_KWARGS = dict(
+    base_url=BASE,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=10.0,
+    http2=True,
+)
+# Shared async client for the *_async functions. Pass `client=` to use one bound to a different event loop.
+_ACLIENT = httpx.AsyncClient(**_ACLIENT_KWARGS)
 
 
 def _get_key(api_key: Optional[str]) -> str:
@@ -23,51 +70,270 @@ def _get_key(api_key: Optional[str]) -> str:
     return key
 
 
-def text_search(query: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+def _cached_fetch(cache: TTLCache, cache_key: Any, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the cached response for `cache_key`, or call `fetch` and cache its result if it succeeded."""
+    with _CACHE_LOCK:
+        hit = cache.get(cache_key)
+    if hit is not None:
+        return hit
+    data = fetch()
+    if data.get('status', 'OK') in _CACHEABLE_STATUSES:
+        with _CACHE_LOCK:
+            cache[cache_key] = data
+    return data
+
+
+def _v1_search_request(key: str, fields: List[str], query: Optional[str] = None,
+                       lat: Optional[float] = None, lng: Optional[float] = None,
+                       radius: Optional[int] = None):
+    """Build (url, json body, headers) for a Places API (New) search with a field mask."""
+    headers = {
+        "X-Goog-Api-Key": key,
+        "X-Goog-FieldMask": ','.join(f if f.startswith('places.') else f"places.{f}" for f in fields),
+    }
+    circle = None
+    if lat is not None and lng is not None:
+        circle = {"circle": {"center": {"latitude": lat, "longitude": lng}, "radius": float(radius or 1000)}}
+    if query:
+        body = {"textQuery": query}
+        if circle:
+            body["locationBias"] = circle
+        return f"{V1_BASE}/places:searchText", body, headers
+    return f"{V1_BASE}/places:searchNearby", {"locationRestriction": circle}, headers
+
+
+def text_search(query: str, api_key: Optional[str] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """Perform a Text Search request.
 
-    Returns the parsed JSON response from Google.
+    Returns the parsed JSON response from Google. If `fields` is given (Places API (New) names,
+    e.g. SUMMARY_FIELDS) the request goes to the v1 endpoint with a field mask and the response
+    has a `places` list instead of `results`.
+    Responses are cached in-process for 10 minutes per (query, fields); treat them as read-only.
     """
     key = _get_key(api_key)
+    fields_t = tuple(fields or ())
+    # Keyed on the normalized query so trivially different spellings share an entry;
+    # the query is still sent to Google exactly as the caller wrote it.
+    return _cached_fetch(_TEXT_SEARCH_CACHE, hashkey(query.lower().strip(), fields_t, key),
+                         lambda: _text_search_fetch(query, fields_t, key))
+
+
+def _text_search_fetch(query: str, fields: Tuple[str, ...], key: str) -> Dict[str, Any]:
+    if fields:
+        url, body, headers = _v1_search_request(key, fields, query=query)
+        resp = _SESSION.post(url, json=body, headers=headers, timeout=10)
+        resp.raise_for_status()
+        return resp.json()
     url = f"{BASE}/textsearch/json"
     params = {"query": query, "key": key}
-    resp = requests.get(url, params=params, timeout=10)
+    resp = _SESSION.get(url, params=params, timeout=10)
     resp.raise_for_status()
     return resp.json()
 
 
-def nearby_search(lat: float, lng: float, radius: int = 1000, keyword: Optional[str] = None, api_key: Optional[str] = None) -> Dict[str, Any]:
+def nearby_search(lat: float, lng: float, radius: int = 1000, keyword: Optional[str] = None, api_key: Optional[str] = None,
+                  fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """Perform a Nearby Search request (location + radius).
 
-    Note: for production you may want to support rankby=distance and pagination (next_page_token).
+    `fields` works as in `text_search`; with a keyword this becomes a v1 text search biased to the circle.
+    Returns only the first page; use `iter_nearby` to follow next_page_token.
     """
     key = _get_key(api_key)
+    if fields:
+        url, body, headers = _v1_search_request(key, fields, query=keyword, lat=lat, lng=lng, radius=radius)
+        resp = _SESSION.post(url, json=body, headers=headers, timeout=10)
+        resp.raise_for_status()
+        return resp.json()
     url = f"{BASE}/nearbysearch/json"
     params = {"location": f"{lat},{lng}", "radius": radius, "key": key}
     if keyword:
         params['keyword'] = keyword
-    resp = requests.get(url, params=params, timeout=10)
+    resp = _SESSION.get(url, params=params, timeout=10)
     resp.raise_for_status()
     return resp.json()
 
 
+def _nearby_page(params: Dict[str, Any], delay: float = 0.0) -> Dict[str, Any]:
+    """Fetch one legacy Nearby Search page, waiting for a fresh page token to become valid."""
+    for _ in range(3):
+        time.sleep(delay)
+        resp = _SESSION.get(f"{BASE}/nearbysearch/json", params=params, timeout=10)
+        resp.raise_for_status()
+        data = resp.json()
+        # A token used too early comes back as INVALID_REQUEST; give it a little longer
+        if not (data.get('status') == 'INVALID_REQUEST' and 'pagetoken' in params):
+            break
+        delay = PAGE_TOKEN_DELAY
+    return data
+
+
+def iter_nearby(lat: float, lng: float, radius: int = 1000, keyword: Optional[str] = None,
+                api_key: Optional[str] = None, max_pages: int = 3) -> Iterator[List[Dict[str, Any]]]:
+    """Yield Nearby Search result pages (up to `max_pages`; Google serves at most 3).
+
+    The next page is fetched in a background thread (including the token delay) while the
+    caller processes the current one.
+    """
+    key = _get_key(api_key)
+    params = {"location": f"{lat},{lng}", "radius": radius, "key": key}
+    if keyword:
+        params['keyword'] = keyword
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = pool.submit(_nearby_page, params)
+        pages = 0
+        while pending is not None:
+            data = pending.result()
+            pages += 1
+            token = data.get('next_page_token')
+            pending = None
+            if token and pages < max_pages:
+                pending = pool.submit(_nearby_page, {"pagetoken": token, "key": key}, PAGE_TOKEN_DELAY)
+            yield data.get('results', [])
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 def place_details(place_id: str, fields: Optional[List[str]] = None, api_key: Optional[str] = None) -> Dict[str, Any]:
     """Get Place Details for a place_id.
 
     `fields` should be a list of fields to minimize payload and billing (e.g. ['name','formatted_address','geometry']).
+    Responses are cached in-process for 10 minutes per (place_id, fields); treat them as read-only.
     """
     key = _get_key(api_key)
+    fields_t = tuple(fields or ())
+    return _cached_fetch(_DETAILS_CACHE, hashkey(place_id, fields_t, key),
+                         lambda: _place_details_fetch(place_id, fields_t, key))
+
+
+def _place_details_fetch(place_id: str, fields: Tuple[str, ...], key: str) -> Dict[str, Any]:
     url = f"{BASE}/details/json"
     params = {"place_id": place_id, "key": key}
     if fields:
         params['fields'] = ','.join(fields)
-    resp = requests.get(url, params=params, timeout=10)
+    resp = _SESSION.get(url, params=params, timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def _aget(path: str, params: Dict[str, Any], client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+    resp = await (client or _ACLIENT).get(path, params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def _apost(url: str, body: Dict[str, Any], headers: Dict[str, str],
+                 client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+    resp = await (client or _ACLIENT).post(url, json=body, headers=headers)
     resp.raise_for_status()
     return resp.json()
 
 
+async def text_search_async(query: str, api_key: Optional[str] = None, fields: Optional[List[str]] = None,
+                            client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+    """Async version of `text_search`."""
+    key = _get_key(api_key)
+    if fields:
+        return await _apost(*_v1_search_request(key, fields, query=query), client)
+    return await _aget("/textsearch/json", {"query": query, "key": key}, client)
+
+
+async def nearby_search_async(lat: float, lng: float, radius: int = 1000, keyword: Optional[str] = None,
+                              api_key: Optional[str] = None, fields: Optional[List[str]] = None,
+                              client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+    """Async version of `nearby_search`."""
+    key = _get_key(api_key)
+    if fields:
+        return await _apost(*_v1_search_request(key, fields, query=keyword, lat=lat, lng=lng, radius=radius), client)
+    params = {"location": f"{lat},{lng}", "radius": radius, "key": key}
+    if keyword:
+        params['keyword'] = keyword
+    return await _aget("/nearbysearch/json", params, client)
+
+
+async def _anearby_page(params: Dict[str, Any], delay: float,
+                        client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+    """Async version of `_nearby_page`."""
+    for _ in range(3):
+        await asyncio.sleep(delay)
+        data = await _aget("/nearbysearch/json", params, client)
+        if not (data.get('status') == 'INVALID_REQUEST' and 'pagetoken' in params):
+            break
+        delay = PAGE_TOKEN_DELAY
+    return data
+
+
+async def aiter_nearby(lat: float, lng: float, radius: int = 1000, keyword: Optional[str] = None,
+                       api_key: Optional[str] = None, max_pages: int = 3,
+                       client: Optional[httpx.AsyncClient] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Async version of `iter_nearby`; the next page is fetched in a task while the caller works."""
+    key = _get_key(api_key)
+    params = {"location": f"{lat},{lng}", "radius": radius, "key": key}
+    if keyword:
+        params['keyword'] = keyword
+    pending = asyncio.ensure_future(_anearby_page(params, 0.0, client))
+    try:
+        pages = 0
+        while pending is not None:
+            data = await pending
+            pages += 1
+            token = data.get('next_page_token')
+            pending = None
+            if token and pages < max_pages:
+                pending = asyncio.ensure_future(
+                    _anearby_page({"pagetoken": token, "key": key}, PAGE_TOKEN_DELAY, client))
+            yield data.get('results', [])
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def place_details_async(place_id: str, fields: Optional[List[str]] = None, api_key: Optional[str] = None,
+                              client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+    """Async version of `place_details`."""
+    key = _get_key(api_key)
+    params = {"place_id": place_id, "key": key}
+    if fields:
+        params['fields'] = ','.join(fields)
+    return await _aget("/details/json", params, client)
+
+
+async def batch_place_details(place_ids: List[str], fields: Optional[List[str]] = None, api_key: Optional[str] = None,
+                              client: Optional[httpx.AsyncClient] = None) -> List[Any]:
+    """Fetch Place Details for many place_ids concurrently.
+
+    Results are in the same order as `place_ids`; a failed lookup yields its exception instead of a dict.
+    """
+    key = _get_key(api_key)
+    tasks = [place_details_async(pid, fields=fields, api_key=key, client=client) for pid in place_ids]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def place_details_many(place_ids: List[str], fields: Optional[List[str]] = None,
+                       api_key: Optional[str] = None) -> List[Any]:
+    """Synchronous wrapper around `batch_place_details` for scripts and the CLI."""
+    async def _run():
+        # asyncio.run creates a new loop each call, so use a client scoped to it
+        async with httpx.AsyncClient(**_ACLIENT_KWARGS) as client:
+            return await batch_place_details(place_ids, fields=fields, api_key=api_key, client=client)
+    return asyncio.run(_run())
+
+
 def normalize_place_summary(place: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a compact dict with common fields from a Place result item."""
+    """Return a compact dict with common fields from a Place result item.
+
+    Accepts both legacy results and Places API (New) `places` items.
+    """
+    if not _V1_ONLY_KEYS.isdisjoint(place):
+        loc = place.get('location') or {}
+        return {
+            'place_id': place.get('id'),
+            'name': (place.get('displayName') or {}).get('text'),
+            'rating': place.get('rating'),
+            'types': place.get('types'),
+            'location': {'lat': loc.get('latitude'), 'lng': loc.get('longitude')} if loc else None,
+            'address': place.get('formattedAddress') or place.get('shortFormattedAddress')
+        }
     return {
         'place_id': place.get('place_id'),
         'name': place.get('name'),
@@ -0,0 +1,73 @@
+import pytest
+
+import google_places_client as gp
+
+
+@pytest.mark.parametrize("place, expected", [
+    ({"rating": 4.1, "formattedAddress": "X"},
+     {"place_id": None, "name": None, "rating": 4.1, "types": None, "location": None, "address": "X"}),
+    ({"id": "p1", "displayName": {"text": "Cafe"}, "location": {"latitude": 1.0, "longitude": 2.0}},
+     {"place_id": "p1", "name": "Cafe", "rating": None, "types": None,
+      "location": {"lat": 1.0, "lng": 2.0}, "address": None}),
+    ({"place_id": "p2", "name": "Diner", "rating": 3.5, "types": ["restaurant"],
+      "geometry": {"location": {"lat": 3.0, "lng": 4.0}}, "vicinity": "Main St"},
+     {"place_id": "p2", "name": "Diner", "rating": 3.5, "types": ["restaurant"],
+      "location": {"lat": 3.0, "lng": 4.0}, "address": "Main St"}),
+])
+def test_normalize_place_summary_detects_shape(place, expected):
+    assert gp.normalize_place_summary(place) == expected
+
+
+class _Resp:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Serve queued JSON bodies from a stub session and count the requests made."""
+    queue, calls = [], []
+
+    def request(url, **kwargs):
+        calls.append(kwargs)
+        return _Resp(queue.pop(0))
+
+    monkeypatch.setattr(gp._SESSION, "get", request)
+    monkeypatch.setattr(gp._SESSION, "post", request)
+    gp._TEXT_SEARCH_CACHE.clear()
+    gp._DETAILS_CACHE.clear()
+    yield queue, calls
+    gp._TEXT_SEARCH_CACHE.clear()
+    gp._DETAILS_CACHE.clear()
+
+
+@pytest.mark.parametrize("status", ["OVER_QUERY_LIMIT", "UNKNOWN_ERROR", "REQUEST_DENIED"])
+def test_error_statuses_are_not_cached(session, status):
+    queue, calls = session
+    queue += [{"status": status}, {"status": "OK", "result": {"name": "A"}},
+              {"status": status}, {"status": "OK", "results": []}]
+    assert gp.place_details("pid", api_key="k")["status"] == status
+    assert gp.place_details("pid", api_key="k")["status"] == "OK"
+    assert gp.text_search("cafe", api_key="k")["status"] == status
+    assert gp.text_search("cafe", api_key="k")["status"] == "OK"
+    assert len(calls) == 4
+
+
+def test_successful_responses_are_cached(session):
+    queue, calls = session
+    queue += [{"status": "ZERO_RESULTS", "results": []}, {"places": [{"id": "p1"}]},
+              {"status": "OK", "result": {"name": "A"}}]
+    gp.text_search("Cafe ", api_key="k")
+    assert gp.text_search("cafe", api_key="k")["status"] == "ZERO_RESULTS"
+    assert calls[0]["params"]["query"] == "Cafe "  # normalized only for the cache key
+    gp.text_search("cafe", api_key="k", fields=["id"])  # v1: no status, cached on 2xx
+    assert gp.text_search("cafe", api_key="k", fields=["id"]) == {"places": [{"id": "p1"}]}
+    gp.place_details("pid", fields=["name"], api_key="k")
+    gp.place_details("pid", fields=["name"], api_key="k")
+    assert len(calls) == 3
@@ -1,116 +1,359 @@
 # hotel_backend.py
 # Minimal backend logic to fetch hotels via Bright Data (Google Hotels SERP)
 
-import os, json, logging, re
-from typing import Any, Dict, List, Optional
+import os, sys, asyncio, logging, re, threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TypedDict
 from urllib.parse import urlencode, quote_plus
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
+from types import MappingProxyType
 import httpx
+import orjson
+from cachetools import TTLCache
+
+try:
+    import ijson  # incremental parser: lets us stop reading the SERP once enough hotels are seen
+except ImportError:
+    ijson = None
+
+try:
+    import diskcache  # persistent SERP cache shared across processes/restarts
+except ImportError:
+    diskcache = None
 
 BRIGHT_API_KEY = os.getenv("BRIGHTDATA_API_KEY")
 BRIGHT_SERP_ZONE = os.getenv("BRIGHTDATA_SERP_ZONE")  # e.g. "serp_api1"
 API_ENDPOINT = "https://api.brightdata.com/request"
 
-CITY_MAP = {
+log = logging.getLogger(__name__)
+
+CITY_MAP = MappingProxyType({
     "NYC": "New York", "JFK": "New York", "LGA": "New York", "EWR": "New York",
     "MIA": "Miami", "FLL": "Fort Lauderdale", "MCO": "Orlando",
     "LAX": "Los Angeles", "SFO": "San Francisco", "SEA": "Seattle",
     "BOS": "Boston", "DFW": "Dallas", "ORD": "Chicago",
     "IAD": "Washington", "DCA": "Washington", "LAS": "Las Vegas", "PHX": "Phoenix",
-}
+})
+# Case-insensitive lookup by IATA code or by city name ("mia", "new york" -> canonical city)
+_CITY_MAP_CI = {**{v.casefold(): v for v in CITY_MAP.values()},
+                **{k.casefold(): v for k, v in CITY_MAP.items()}}
+
+# Pooled client: keep-alive connections to Bright Data are reused across searches, and with
+# HTTP/2 concurrent searches are multiplexed over one connection instead of opening more
+_HTTPX = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    timeout=60.0,
+)
+_AHTTPX_KWARGS = dict(
+    http2=True,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+    timeout=60.0,
+)
+# Shared async client for search_hotels_google_async. Pass `client=` to use one bound to a different event loop.
+_AHTTPX = httpx.AsyncClient(**_AHTTPX_KWARGS)
+# Max in-flight Bright Data requests for search_hotels_google_many
+MAX_CONCURRENT_SEARCHES = 8
+
+# Search results per (city, dates, adults, currency, ...). Prices don't move within a conversation turn.
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=256, ttl=600)
+_SEARCH_CACHE_LOCK = threading.Lock()  # TTLCache isn't thread-safe; searches may run on worker threads
+
+# Extracted HotelRows keyed by (Google Hotels URL, limit), on disk, so repeat searches skip Bright Data
+# entirely. Rows rather than raw bodies, so a streamed search never has to read past what it parsed.
+# The directory must be private to this user: diskcache will unpickle values whose stored mode says so.
+SERP_CACHE_DIR = os.getenv("HOTEL_SERP_CACHE_DIR") or os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "hotel_serp_cache")
+SERP_CACHE_TTL = 1800  # seconds
+
+# Candidate keys per field, in priority order, for hotel records inside the SERP JSON
+_NAME_KEYS = ("name", "title")
+_RATING_KEYS = ("overall_rating", "rating", "stars", "star_rating")
+_PRICE_KEYS = ("price_text", "price", "rate", "rate_per_night")
+_ADDR_KEYS = ("address", "neighborhood", "vicinity", "location")
+_URL_KEYS = ("url", "link", "g_url", "maps_url", "hotel_url", "booking_url", "result_url", "place_link")
+_PRICE_RE = re.compile(r"(\d[\d,]*)")
+# Every key the extractor reads; the streaming parser keeps only these
+_RECORD_KEYS = frozenset(_NAME_KEYS + _RATING_KEYS + _PRICE_KEYS + _ADDR_KEYS + _URL_KEYS)
+# Subtrees that never hold hotel records (and are often the bulkiest parts of the SERP); not descended into
+_SKIP_KEYS = frozenset({"reviews", "photos", "images", "user_photos", "about", "description", "amenities",
+                        "policies", "nearby_places", "serpapi_pagination", "search_metadata"})
 
 class BrightDataError(RuntimeError): ...
 
+class HotelResult(TypedDict):
+    """One entry of search_hotels_google's result."""
+    name: str
+    area: Any
+    stars: float
+    price_per_night_usd: Optional[float]
+    total_usd: Optional[float]
+    url: str
+
+@dataclass(slots=True)
+class HotelRow:
+    """One hotel extracted from the SERP, before pricing/fallbacks are applied."""
+    name: str
+    rating: Optional[float]
+    area: Any
+    price_usd: Optional[float]
+    url: Optional[str]
+
 def _require_creds():
     if not BRIGHT_API_KEY or not BRIGHT_SERP_ZONE:
         raise BrightDataError("Set BRIGHTDATA_API_KEY and BRIGHTDATA_SERP_ZONE env vars")
 
+@lru_cache(maxsize=256)
 def _nights(checkin: str, checkout: str) -> int:
     try:
-        d0 = datetime.strptime(checkin, "%Y-%m-%d").date()
-        d1 = datetime.strptime(checkout, "%Y-%m-%d").date()
-        return max(1, (d1 - d0).days)
-    except Exception:
+        return max(1, (date.fromisoformat(checkout) - date.fromisoformat(checkin)).days)
+    except (TypeError, ValueError):
         return 1
 
-def serp_direct(url: str, timeout: float = 60.0) -> httpx.Response:
+def _serp_request(url: str):
     _require_creds()
     headers = {"Authorization": f"Bearer {BRIGHT_API_KEY}", "Content-Type": "application/json"}
     payload = {"zone": BRIGHT_SERP_ZONE, "url": url, "format": "raw"}  # url must include brd_json=1
-    resp = httpx.post(API_ENDPOINT, headers=headers, json=payload, timeout=timeout)
+    return headers, payload
+
+@lru_cache(maxsize=None)
+def _serp_cache():
+    """Open the disk cache on first use; None if diskcache is missing or the directory is unusable or not private."""
+    if diskcache is None:
+        return None
+    try:
+        os.makedirs(SERP_CACHE_DIR, mode=0o700, exist_ok=True)
+        if hasattr(os, "getuid"):
+            st = os.stat(SERP_CACHE_DIR)
+            if st.st_uid != os.getuid() or st.st_mode & 0o077:
+                log.warning("SERP cache disabled: %s must be owned by this user with mode 0700", SERP_CACHE_DIR)
+                return None
+        return diskcache.Cache(SERP_CACHE_DIR, size_limit=2 << 30)
+    except Exception:
+        log.warning("SERP cache unavailable at %s", SERP_CACHE_DIR, exc_info=True)
+        return None
+
+def _rows_cache_key(url: str, limit: int) -> str:
+    return f"{limit}:{url}"  # str keys are stored as-is, not pickled
+
+def _cached_rows(url: str, limit: int) -> Optional[List[HotelRow]]:
+    cache = _serp_cache()
+    if cache is None:
+        return None
+    try:
+        body = cache.get(_rows_cache_key(url, limit))
+        if not isinstance(body, bytes):
+            return None
+        return [HotelRow(**r) for r in orjson.loads(body)]
+    except Exception:
+        log.warning("SERP cache read failed", exc_info=True)
+        return None
+
+def _cache_rows(url: str, limit: int, rows: List[HotelRow]) -> None:
+    """Best effort: a failing cache must never cost the caller a result it already has."""
+    cache = _serp_cache()
+    if cache is None or not rows:
+        return
+    try:
+        # JSON bytes rather than pickled HotelRows (orjson serializes dataclasses directly)
+        cache.set(_rows_cache_key(url, limit), orjson.dumps(rows), expire=SERP_CACHE_TTL)
+    except Exception:
+        log.warning("SERP cache write failed", exc_info=True)
+
+def serp_direct(url: str, timeout: float = 60.0) -> httpx.Response:
+    headers, payload = _serp_request(url)
+    resp = _HTTPX.post(API_ENDPOINT, headers=headers, json=payload, timeout=timeout)
     resp.raise_for_status()
     return resp
 
-def _extract_hotels_from_serp_json(data: Any, limit: int = 12) -> List[Dict[str, Any]]:
-    """
-    Walk Bright Data's parsed JSON (Google Hotels) and extract rows:
-    {name, rating, area, price_usd (per-night if parseable), url (if present)}
-    """
-    found = []
-    URL_KEYS = {"url","link","g_url","maps_url","hotel_url","booking_url","result_url","place_link"}
-
-    def _to_float(v) -> Optional[float]:
-        try: return float(v)
-        except Exception: return None
-
-    def _to_price_usd(s: Optional[str]) -> Optional[float]:
-        if not s: return None
-        m = re.search(r"(\d[\d,]*)", s)
-        return float(m.group(1).replace(",", "")) if m else None
-
-    def _pick_url(d: dict) -> Optional[str]:
-        for k in URL_KEYS:
-            v = d.get(k)
-            if isinstance(v, str) and v.startswith("http"):
-                return v
-        return None
+async def serp_direct_async(url: str, timeout: float = 60.0,
+                            client: Optional[httpx.AsyncClient] = None) -> httpx.Response:
+    headers, payload = _serp_request(url)
+    resp = await (client or _AHTTPX).post(API_ENDPOINT, headers=headers, json=payload, timeout=timeout)
+    resp.raise_for_status()
+    return resp
+
+@contextmanager
+def serp_stream(url: str, timeout: float = 60.0) -> Iterator[httpx.Response]:
+    """Like serp_direct, but the body is not read up front; consume it via resp.iter_bytes()."""
+    headers, payload = _serp_request(url)
+    with _HTTPX.stream("POST", API_ENDPOINT, headers=headers, json=payload, timeout=timeout) as resp:
+        resp.raise_for_status()
+        yield resp
+
+class _ChunkReader:
+    """Minimal file-like wrapper so ijson can read from an iterator of byte chunks."""
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        if size == 0:  # ijson probes read(0) to detect bytes vs str
+            return b""
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+def _first(d: dict, keys) -> Any:
+    """First truthy value among `keys` in `d` (like chaining `d.get(a) or d.get(b) ...`)."""
+    for k in keys:
+        v = d.get(k)
+        if v:
+            return v
+    return None
+
+def _to_float(v) -> Optional[float]:
+    try: return float(v)
+    except Exception: return None
+
+def _to_price_usd(s: Optional[str]) -> Optional[float]:
+    if not s: return None
+    m = _PRICE_RE.search(s)
+    return float(m.group(1).replace(",", "")) if m else None
+
+def _pick_url(d: dict) -> Optional[str]:
+    for k in _URL_KEYS:
+        v = d.get(k)
+        if isinstance(v, str) and v.startswith("http"):
+            return v
+    return None
 
-    def walk(node: Any):
+def _iter_dicts(data: Any) -> Iterator[dict]:
+    """Yield every dict in a parsed JSON tree, depth-first in document order, skipping _SKIP_KEYS subtrees."""
+    # Explicit stack; children are pushed reversed so they pop in document order.
+    stack = [data]
+    while stack:
+        node = stack.pop()
         if isinstance(node, dict):
-            name = node.get("name") or node.get("title")
-            rating = node.get("overall_rating") or node.get("rating") or node.get("stars") or node.get("star_rating")
-            price_text = node.get("price_text") or node.get("price") or node.get("rate") or node.get("rate_per_night")
-            address = node.get("address") or node.get("neighborhood") or node.get("vicinity") or node.get("location")
-            url = _pick_url(node)
-            if name and (rating or price_text):
-                found.append({"name": str(name), "rating": _to_float(rating),
-                              "price_text": str(price_text) if price_text is not None else None,
-                              "address": address, "url": url})
-            for v in node.values(): walk(v)
+            yield node
+            stack.extend(reversed([v for k, v in node.items() if k not in _SKIP_KEYS]))
         elif isinstance(node, list):
-            for v in node: walk(v)
+            stack.extend(reversed(node))
 
-    walk(data)
+class _StreamFrame:
+    """An open JSON object while streaming: its hotel-relevant fields plus records held back for ordering."""
+    __slots__ = ("fields", "named", "held")
 
-    out, seen = [], set()
-    for h in found:
-        if h["name"] in seen: continue
-        seen.add(h["name"])
-        out.append({
-            "name": h["name"],
-            "rating": h["rating"],
-            "area": h.get("address"),
-            "price_usd": _to_price_usd(h.get("price_text")),
-            "url": h.get("url"),
-        })
-        if len(out) >= limit: break
-    return out
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.named = False  # has a truthy name; may itself be a hotel, so descendants must come out after it
+        self.held: List[dict] = []
 
-def search_hotels_google(
-    city_or_iata: str,
-    checkin: str,
-    checkout: str,
-    adults: int = 2,
-    currency: str = "USD",
-    country: str = "us",
-    lang: str = "en",
-    limit: int = 12,
-) -> List[Dict[str, Any]]:
+    def set(self, key: str, value: Any) -> None:
+        self.fields[key] = value
+        if value and key in _NAME_KEYS:
+            self.named = True
+
+def _iter_dicts_streaming(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """Streaming counterpart of _iter_dicts, for a raw JSON byte stream.
+
+    Each object is yielded as a dict of just the keys the extractor reads (_RECORD_KEYS), with nested
+    values under those keys built in full. Objects are yielded in the same order as _iter_dicts: an object
+    that has a name keeps its descendants back until it closes, so it still comes out before them.
+    Everything else is yielded as soon as it closes, so the stream is only read as far as the caller iterates
+    and memory stays bounded by the current path. (An ancestor whose name key only appears after its
+    nested hotels can't be detected in time; SERP containers don't look like that.)
+    Containers under _SKIP_KEYS are still parsed (to find where they end) but produce nothing.
     """
-    Returns a list of hotels with fields:
-      { name, area, stars, price_per_night_usd, total_usd, url }
+    stack: List[Optional[_StreamFrame]] = []  # one frame per open object, None per open array
+    captures: list = []  # [builder, frame, key, depth] for values under _RECORD_KEYS being built
+    key = None
+    depth = 0  # open containers, including skipped ones
+    skip_depth = 0  # > 0 while inside a skipped container
+    for _, event, value in ijson.parse(_ChunkReader(chunks), use_float=True):
+        starts = event == "start_map" or event == "start_array"
+        ends = event == "end_map" or event == "end_array"
+        parent = stack[-1] if stack else None
+
+        if starts and not skip_depth and parent is not None and key in _RECORD_KEYS:
+            captures.append([ijson.ObjectBuilder(), parent, key, depth])
+        for c in captures:
+            c[0].event(event, value)
+        if starts:
+            depth += 1
+        elif ends:
+            depth -= 1
+            if captures and captures[-1][3] == depth:
+                builder, frame, k, _ = captures.pop()
+                frame.set(k, builder.value)
+
+        if skip_depth:
+            if starts:
+                skip_depth += 1
+            elif ends:
+                skip_depth -= 1
+        elif event == "map_key":
+            key = value
+        elif starts and parent is not None and key in _SKIP_KEYS:
+            skip_depth = 1
+        elif event == "start_map":
+            stack.append(_StreamFrame())
+        elif event == "start_array":
+            stack.append(None)
+        elif event == "end_array":
+            stack.pop()
+        elif event == "end_map":
+            frame = stack.pop()
+            done = [frame.fields] if frame.fields else []
+            done += frame.held
+            holder = next((f for f in reversed(stack) if f is not None and f.named), None)
+            if holder is not None:
+                holder.held.extend(done)
+            else:
+                yield from done
+        elif parent is not None and key in _RECORD_KEYS:
+            parent.set(key, value)
+
+def _norm_name(name: str) -> str:
+    """Dedup key: casefolded, whitespace-collapsed hotel name."""
+    return " ".join(name.casefold().split())
+
+def _extract_hotels(nodes: Iterable[dict], limit: int) -> List[HotelRow]:
+    found: Dict[str, HotelRow] = {}  # keyed by _norm_name, first occurrence wins
+    # locals: this loop visits every node
+    first, pick_url, to_float, to_price, norm = _first, _pick_url, _to_float, _to_price_usd, _norm_name
+
+    for node in nodes:
+        name = first(node, _NAME_KEYS)
+        rating = first(node, _RATING_KEYS)
+        price_text = first(node, _PRICE_KEYS)
+        if name and (rating or price_text):
+            name = str(name)
+            key = norm(name)
+            if key in found: continue
+            found[key] = HotelRow(name, to_float(rating), first(node, _ADDR_KEYS),
+                                  to_price(str(price_text) if price_text is not None else None), pick_url(node))
+            # Stop walking (or reading the stream) as soon as `limit` distinct hotels are in hand
+            if len(found) >= limit:
+                break
+    return list(found.values())
+
+def _extract_hotels_from_serp_json(data: Any, limit: int = 12) -> List[HotelRow]:
+    """
+    Walk Bright Data's parsed JSON (Google Hotels) and extract HotelRows:
+    name, rating, area, price_usd (per-night if parseable), url (if present)
     """
-    city = CITY_MAP.get(city_or_iata.upper(), city_or_iata)
+    return _extract_hotels(_iter_dicts(data), limit)
+
+def _extract_hotels_from_serp_stream(chunks: Iterable[bytes], limit: int = 12) -> List[HotelRow]:
+    """Same as _extract_hotels_from_serp_json, but parses the raw response incrementally (needs ijson)."""
+    return _extract_hotels(_iter_dicts_streaming(chunks), limit)
+
+def _search_cache_get(cache_key: tuple) -> Optional[List[HotelResult]]:
+    with _SEARCH_CACHE_LOCK:
+        hit = _SEARCH_CACHE.get(cache_key)
+    return [dict(h) for h in hit] if hit is not None else None
+
+def _search_cache_set(cache_key: tuple, out: List[HotelResult]) -> None:
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE[cache_key] = [dict(h) for h in out]
+
+def _hotels_query(city_or_iata: str, checkin: str, checkout: str, adults: int, currency: str,
+                  country: str, lang: str, limit: int):
+    """Resolve the city and build (city, Google Hotels URL, cache key) for a search."""
+    city = _CITY_MAP_CI.get(city_or_iata.casefold(), city_or_iata)
     q = {
         "q": f"hotels in {city}",
         "gl": country, "hl": lang,
@@ -119,29 +362,24 @@ def search_hotels_google(
         "brd_currency": currency,
         "brd_json": "1",  # ask Google Hotels page (via BD) to respond with structured JSON
     }
-    url = f"https://www.google.com/travel/hotels?{urlencode(q, quote_via=quote_plus)}"
-
-    try:
-        res = serp_direct(url)
-        data = res.json()
-    except Exception as e:
-        logging.exception("Bright Data request failed: %s", e)
-        return []
+    url = f"https://www.google.com/travel/hotels?{urlencode(q)}"
+    return city, url, (city, checkin, checkout, adults, currency, country, lang, limit)
 
-    rows = _extract_hotels_from_serp_json(data, limit=limit)
+def _hotels_output(rows: List[HotelRow], city: str, checkin: str, checkout: str) -> List[HotelResult]:
     nights = _nights(checkin, checkout)
+    city_q = quote_plus(city)
 
     out = []
     for r in rows:
-        name = r.get("name") or "Hotel"
-        area = r.get("area") or "Central"
-        stars = float(r.get("rating") or 3.5)
-        p_night = r.get("price_usd")
+        name = r.name or "Hotel"
+        area = r.area or "Central"
+        stars = float(r.rating or 3.5)
+        p_night = r.price_usd
         total = (p_night * nights) if isinstance(p_night, (int, float)) else None
 
         # URL fallback to Google Maps search if SERP didn’t provide a deep link
-        bd_url = r.get("url")
-        fallback_url = f"https://www.google.com/maps/search/?api=1&query={quote_plus(f'{name} {city}')}"
+        bd_url = r.url
+        fallback_url = f"https://www.google.com/maps/search/?api=1&query={quote_plus(name)}+{city_q}"
         url_final = bd_url or fallback_url
 
         out.append({
@@ -154,6 +392,114 @@ def search_hotels_google(
         })
     return out
 
+def search_hotels_google(
+    city_or_iata: str,
+    checkin: str,
+    checkout: str,
+    adults: int = 2,
+    currency: str = "USD",
+    country: str = "us",
+    lang: str = "en",
+    limit: int = 12,
+) -> List[HotelResult]:
+    """
+    Returns a list of hotels with fields:
+      { name, area, stars, price_per_night_usd, total_usd, url }
+    """
+    city, url, cache_key = _hotels_query(city_or_iata, checkin, checkout, adults, currency, country, lang, limit)
+    hit = _search_cache_get(cache_key)
+    if hit is not None:
+        return hit
+
+    rows = _cached_rows(url, limit)
+    if rows is None:
+        try:
+            if ijson is not None:
+                with serp_stream(url) as res:
+                    rows = _extract_hotels_from_serp_stream(res.iter_bytes(), limit=limit)
+            else:
+                res = serp_direct(url)
+                data = orjson.loads(res.content)  # SERP bodies are large; orjson decodes them several times faster
+                rows = _extract_hotels_from_serp_json(data, limit=limit)
+        except httpx.TimeoutException:
+            log.warning("Bright Data request timed out")  # transient; no traceback needed
+            return []
+        except Exception:
+            log.exception("Bright Data request failed")
+            return []
+        _cache_rows(url, limit, rows)
+
+    out = _hotels_output(rows, city, checkin, checkout)
+    if out:
+        _search_cache_set(cache_key, out)
+    return out
+
+async def search_hotels_google_async(
+    city_or_iata: str,
+    checkin: str,
+    checkout: str,
+    adults: int = 2,
+    currency: str = "USD",
+    country: str = "us",
+    lang: str = "en",
+    limit: int = 12,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[HotelResult]:
+    """Async version of search_hotels_google (same arguments and result shape)."""
+    city, url, cache_key = _hotels_query(city_or_iata, checkin, checkout, adults, currency, country, lang, limit)
+    hit = _search_cache_get(cache_key)
+    if hit is not None:
+        return hit
+
+    # diskcache does blocking sqlite I/O; keep it off the event loop
+    rows = await asyncio.to_thread(_cached_rows, url, limit)
+    if rows is None:
+        try:
+            res = await serp_direct_async(url, client=client)
+            rows = _extract_hotels_from_serp_json(orjson.loads(res.content), limit=limit)
+        except httpx.TimeoutException:
+            log.warning("Bright Data request timed out")  # transient; no traceback needed
+            return []
+        except Exception:
+            log.exception("Bright Data request failed")
+            return []
+        await asyncio.to_thread(_cache_rows, url, limit, rows)
+
+    out = _hotels_output(rows, city, checkin, checkout)
+    if out:
+        _search_cache_set(cache_key, out)
+    return out
+
+async def search_hotels_google_many_async(
+    queries: Sequence[Sequence[Any]],
+    concurrency: int = MAX_CONCURRENT_SEARCHES,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[List[HotelResult]]:
+    """
+    Run several searches concurrently, e.g. one per city of a multi-city trip.
+    Each query is a tuple of search_hotels_google_async positional args:
+      (city_or_iata, checkin, checkout[, adults, currency, ...])
+    Results come back in query order; at most `concurrency` requests are in flight.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(q: Sequence[Any]) -> List[HotelResult]:
+        async with sem:
+            return await search_hotels_google_async(*q, client=client)
+
+    return await asyncio.gather(*(_one(q) for q in queries))
+
+def search_hotels_google_many(
+    queries: Sequence[Sequence[Any]],
+    concurrency: int = MAX_CONCURRENT_SEARCHES,
+) -> List[List[HotelResult]]:
+    """Synchronous wrapper around search_hotels_google_many_async."""
+    async def _run():
+        # asyncio.run creates a new loop each call, so use a client scoped to it
+        async with httpx.AsyncClient(**_AHTTPX_KWARGS) as client:
+            return await search_hotels_google_many_async(queries, concurrency=concurrency, client=client)
+    return asyncio.run(_run())
+
 # --- CLI usage: python hotel_backend.py --city MIA --checkin 2025-12-05 --checkout 2025-12-08 --adults 2 --limit 8
 if __name__ == "__main__":
     import argparse
@@ -165,9 +511,11 @@ if __name__ == "__main__":
     parser.add_argument("--limit", type=int, default=8)
     args = parser.parse_args()
 
+    # orjson emits UTF-8 bytes; write them straight to the binary stdout
     try:
         hotels = search_hotels_google(args.city, args.checkin, args.checkout, adults=args.adults, limit=args.limit)
-        print(json.dumps({"city": args.city, "checkin": args.checkin, "checkout": args.checkout,
-                          "adults": args.adults, "results": hotels}, indent=2))
+        sys.stdout.buffer.write(orjson.dumps({"city": args.city, "checkin": args.checkin, "checkout": args.checkout,
+                                              "adults": args.adults, "results": hotels},
+                                             option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
     except BrightDataError as e:
-        print(json.dumps({"error": str(e)}))
+        sys.stdout.buffer.write(orjson.dumps({"error": str(e)}, option=orjson.OPT_APPEND_NEWLINE))
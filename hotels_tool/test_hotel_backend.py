@@ -0,0 +1,148 @@
+import os
+
+import httpx
+import orjson
+import pytest
+
+pytest.importorskip("ijson")
+
+import hotel_backend as hb
+
+# Shaped like a Bright Data Google Hotels SERP (brd_json=1): nested prices/locations,
+# a property with a nested sub-listing, review/photo subtrees, and near-duplicate names.
+SERP = {
+    "search_metadata": {"id": "abc", "title": "Hotels in Miami", "rating": 5},
+    "properties": [
+        {
+            "name": "Alpha Inn",
+            "overall_rating": 4.3,
+            "rate_per_night": {"lowest": "$120", "extracted_lowest": 120},
+            "location": {"lat": 25.77, "lng": -80.19, "neighborhood": "Brickell"},
+            "link": "https://example.com/alpha",
+            "reviews": [{"name": "Jane", "rating": 1}],
+        },
+        {
+            "title": "Bayside Suites",
+            "price": "$1,050",
+            "images": [{"title": "Lobby", "rating": 3}],
+            "rooms": [{"name": "Bayside Suites - King", "rate": "$210", "url": "https://example.com/king"}],
+            "neighborhood": "Downtown",
+        },
+        {"name": "  alpha   INN ", "rating": 3.9, "price_text": "$99"},
+        {"name": "Coral Hotel", "stars": "4", "address": {"street": "1 Ocean Dr", "city": "Miami"}},
+        {"name": "No Price Or Rating", "address": "Somewhere"},
+        {"ads": [{"name": "Delta Lodge", "rate_per_night": {"lowest": "$88"}, "g_url": "https://example.com/d"}]},
+    ] + [{"name": f"Filler {i}", "rating": 3.0 + i / 10, "price": f"${100 + i}"} for i in range(10)],
+}
+
+
+def _chunks(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("limit", [1, 3, 5, 12, 50])
+@pytest.mark.parametrize("chunk_size", [7, 4096])
+def test_streaming_matches_in_memory(limit, chunk_size):
+    body = orjson.dumps(SERP)
+    expected = hb._extract_hotels_from_serp_json(orjson.loads(body), limit=limit)
+    assert hb._extract_hotels_from_serp_stream(_chunks(body, chunk_size), limit=limit) == expected
+
+
+def test_nested_fields_and_order():
+    rows = hb._extract_hotels_from_serp_stream([orjson.dumps(SERP)], limit=5)
+    assert [r.name for r in rows] == ["Alpha Inn", "Bayside Suites", "Bayside Suites - King", "Coral Hotel",
+                                      "Delta Lodge"]
+    alpha = rows[0]
+    assert alpha.price_usd == 120.0
+    assert alpha.area == {"lat": 25.77, "lng": -80.19, "neighborhood": "Brickell"}
+    assert alpha.url == "https://example.com/alpha"
+    assert rows[-1].price_usd == 88.0
+
+
+def test_streaming_stops_reading_early():
+    chunks = _chunks(orjson.dumps(SERP), 16)
+    consumed = []
+
+    def feed():
+        for c in chunks:
+            consumed.append(c)
+            yield c
+
+    hb._extract_hotels_from_serp_stream(feed(), limit=2)
+    assert len(consumed) < len(chunks)
+
+
+@pytest.fixture
+def bright_data(monkeypatch, tmp_path):
+    """Point the backend at a mock Bright Data endpoint and an isolated disk cache."""
+    monkeypatch.setattr(hb, "BRIGHT_API_KEY", "key")
+    monkeypatch.setattr(hb, "BRIGHT_SERP_ZONE", "zone")
+    monkeypatch.setattr(hb, "SERP_CACHE_DIR", str(tmp_path / "serp"))
+    hb._serp_cache.cache_clear()
+    hb._SEARCH_CACHE.clear()
+    calls = []
+
+    def install(body_chunks):
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, content=body_chunks())
+        monkeypatch.setattr(hb, "_HTTPX", httpx.Client(transport=httpx.MockTransport(handler)))
+        return calls
+
+    yield install
+    hb._serp_cache.cache_clear()
+    hb._SEARCH_CACHE.clear()
+
+
+def test_tail_timeout_keeps_rows_already_extracted(bright_data):
+    chunks = _chunks(orjson.dumps(SERP), 64)
+
+    def body():
+        for i, c in enumerate(chunks):
+            if i == len(chunks) - 3:
+                raise httpx.ReadTimeout("tail")
+            yield c
+
+    bright_data(body)
+    rows = hb.search_hotels_google("MIA", "2025-12-05", "2025-12-08", limit=3)
+    assert [r["name"] for r in rows] == ["Alpha Inn", "Bayside Suites", "Bayside Suites - King"]
+
+
+def test_disk_cache_serves_repeat_search_and_write_failure_is_harmless(bright_data, monkeypatch):
+    pytest.importorskip("diskcache")
+    calls = bright_data(lambda: iter([orjson.dumps(SERP)]))
+    first = hb.search_hotels_google("MIA", "2025-12-05", "2025-12-08", limit=3)
+    hb._SEARCH_CACHE.clear()
+    assert hb.search_hotels_google("MIA", "2025-12-05", "2025-12-08", limit=3) == first
+    assert len(calls) == 1
+
+    def broken_set(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(hb._serp_cache(), "set", broken_set)
+    assert hb.search_hotels_google("MIA", "2025-12-06", "2025-12-08", limit=3)
+
+
+def test_disk_cache_stores_json_not_pickles(bright_data):
+    pytest.importorskip("diskcache")
+    bright_data(lambda: iter([orjson.dumps(SERP)]))
+    hb.search_hotels_google("MIA", "2025-12-05", "2025-12-08", limit=2)
+    cache = hb._serp_cache()
+    (key,) = list(cache.iterkeys())
+    assert isinstance(key, str)
+    stored = orjson.loads(cache.get(key))
+    assert [r["name"] for r in stored] == ["Alpha Inn", "Bayside Suites"]
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions only")
+def test_disk_cache_refuses_shared_directory(monkeypatch, tmp_path):
+    pytest.importorskip("diskcache")
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    monkeypatch.setattr(hb, "SERP_CACHE_DIR", str(shared))
+    hb._serp_cache.cache_clear()
+    try:
+        assert hb._serp_cache() is None
+        assert hb._cached_rows("https://example.com", 3) is None
+    finally:
+        hb._serp_cache.cache_clear()